@@ -2,22 +2,25 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
 from math import sqrt
+from operator import itemgetter
+from typing import Sequence
 
-from dop.models import Entry
+from dop.models import Columns, Entry
 from dop.utils import clamp
 
 
-def detect_sleep_debt(entries: list[Entry], ideal_sleep: float = 7.0) -> float:
+def detect_sleep_debt(history: list[Entry] | Columns, ideal_sleep: float = 7.0) -> float:
     """Calculate cumulative sleep debt over recent entries."""
-    if not entries:
+    if not history:
         return 0.0
 
-    debt = 0.0
-    for entry in entries[-7:]:  # last 7 entries
-        if entry.sleep < ideal_sleep:
-            debt += ideal_sleep - entry.sleep
+    if isinstance(history, Columns):
+        recent = history.sleep[-7:]  # last 7 entries
+    else:
+        recent = [entry.sleep for entry in history[-7:]]
+    debt = sum((ideal_sleep - hours for hours in recent if hours < ideal_sleep), 0.0)
 
     return round(debt, 2)
 
@@ -47,6 +50,28 @@ def calculate_dls(coffee: int, cig: int, gaming: float) -> float:
     return round(coffee + cig + gaming, 2)
 
 
+def calculate_des_batch(history: list[Entry] | Columns) -> list[float]:
+    """Recompute DES for every record, e.g. after a weighting change."""
+    columns = _as_columns(history)
+    return list(
+        map(
+            calculate_des,
+            columns.focus,
+            columns.mood,
+            columns.energy,
+            columns.sleep,
+            columns.coffee,
+            columns.cig,
+        )
+    )
+
+
+def calculate_dls_batch(history: list[Entry] | Columns) -> list[float]:
+    """Recompute DLS for every record."""
+    columns = _as_columns(history)
+    return list(map(calculate_dls, columns.coffee, columns.cig, columns.gaming))
+
+
 def detect_flags(entry: Entry, overstim_threshold: float = 8.0) -> list[str]:
     """Detect notable behavioral conditions for a single entry."""
     flags: list[str] = []
@@ -59,42 +84,69 @@ def detect_flags(entry: Entry, overstim_threshold: float = 8.0) -> list[str]:
     return flags
 
 
-def average(values: list[float]) -> float:
+def average(values: Sequence[float]) -> float:
     """Return arithmetic mean, or 0 when list is empty."""
     if not values:
         return 0.0
     return sum(values) / len(values)
 
 
-def pearson_correlation(x_values: list[float], y_values: list[float]) -> float:
+def pearson_correlation(x_values: Sequence[float], y_values: Sequence[float]) -> float:
     """Compute Pearson correlation coefficient."""
     if len(x_values) != len(y_values) or len(x_values) < 2:
         return 0.0
 
-    x_mean = average(x_values)
-    y_mean = average(y_values)
+    # Accumulate offsets from the first sample: a constant series then sums
+    # to exactly zero, and large shared offsets cannot cancel catastrophically.
+    x0 = x_values[0]
+    y0 = y_values[0]
+    n = 0
+    sx = sy = sxx = syy = sxy = 0.0
+    for xv, yv in zip(x_values, y_values):
+        dx = xv - x0
+        dy = yv - y0
+        n += 1
+        sx += dx
+        sy += dy
+        sxx += dx * dx
+        syy += dy * dy
+        sxy += dx * dy
+
+    x_spread = n * sxx - sx * sx
+    y_spread = n * syy - sy * sy
+    if x_spread <= 0 or y_spread <= 0:
+        return 0.0
+
+    # Clamp the last-ulp overshoot of perfectly (anti)correlated data.
+    return clamp((n * sxy - sx * sy) / sqrt(x_spread * y_spread), -1.0, 1.0)
 
-    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_values, y_values))
-    x_var = sum((x - x_mean) ** 2 for x in x_values)
-    y_var = sum((y - y_mean) ** 2 for y in y_values)
 
-    denominator = sqrt(x_var * y_var)
-    if denominator == 0:
-        return 0.0
+def _bucket_label(index: int, width: float) -> str:
+    """Create range labels like 4.0-5.9 for integer bucket indices."""
+    lower = index * width
+    return f"{lower:.1f}-{lower + width - 0.1:.1f}"
 
-    return numerator / denominator
 
+def _group_means(keys: Sequence[int], values: Sequence[float]) -> dict[int, float]:
+    """Mean of values per key, in first-seen key order (a dict-based bincount)."""
+    sums: dict[int, float] = {}
+    counts: dict[int, int] = {}
+    for key, value in zip(keys, values):
+        sums[key] = sums.get(key, 0) + value
+        counts[key] = counts.get(key, 0) + 1
+    return {key: total / counts[key] for key, total in sums.items()}
 
-def _bucket_range(value: float, width: float) -> str:
-    """Create range bucket labels like 4.0-5.9."""
-    lower = int(value // width) * width
-    upper = lower + width - 0.1
-    return f"{lower:.1f}-{upper:.1f}"
 
+def _as_columns(history: list[Entry] | Columns) -> Columns:
+    """Return history as columns, transposing entry lists on demand."""
+    if isinstance(history, Columns):
+        return history
+    return Columns.from_entries(history)
 
-def detect_optimal_zone(entries: list[Entry]) -> dict[str, str]:
+
+def detect_optimal_zone(history: list[Entry] | Columns) -> dict[str, str]:
     """Determine optimal behavioral zones from historical data."""
-    if not entries:
+    if not history:
         return {
             "coffee": "No data",
             "sleep": "No data",
@@ -102,36 +154,30 @@ def detect_optimal_zone(entries: list[Entry]) -> dict[str, str]:
             "stable_mood_sleep": "No data",
         }
 
-    coffee_groups: dict[int, list[int]] = defaultdict(list)
-    sleep_groups: dict[str, list[int]] = defaultdict(list)
-    cig_groups: dict[int, list[int]] = defaultdict(list)
-
-    for entry in entries:
-        coffee_groups[entry.coffee].append(entry.focus)
-        sleep_groups[_bucket_range(entry.sleep, 2.0)].append(entry.focus)
-        cig_groups[entry.cig].append(entry.focus)
+    columns = _as_columns(history)
+    coffee_means = _group_means(columns.coffee, columns.focus)
+    sleep_means = _group_means([int(hours // 2.0) for hours in columns.sleep], columns.focus)
+    cig_means = _group_means(columns.cig, columns.focus)
 
-    best_coffee = max(coffee_groups.items(), key=lambda item: average(item[1]))
-    best_sleep = max(sleep_groups.items(), key=lambda item: average(item[1]))
+    best_coffee = max(coffee_means, key=coffee_means.__getitem__)
+    best_sleep = max(sleep_means, key=sleep_means.__getitem__)
 
-    sorted_cig = sorted(cig_groups.items(), key=lambda item: item[0])
+    sorted_cig = sorted(cig_means)
     decline_threshold = "No clear threshold"
-    baseline = average(sorted_cig[0][1]) if sorted_cig else 0
-    for cig_count, focuses in sorted_cig[1:]:
-        if average(focuses) < baseline - 1:
+    baseline = cig_means[sorted_cig[0]]
+    for cig_count in sorted_cig[1:]:
+        if cig_means[cig_count] < baseline - 1:
             decline_threshold = f">= {cig_count} cig/day"
             break
 
-    stable_mood_entries = [entry for entry in entries if entry.mood >= 7]
-    min_sleep = (
-        min(entry.sleep for entry in stable_mood_entries)
-        if stable_mood_entries
-        else min(entry.sleep for entry in entries)
-    )
+    stable_mood_sleeps = [
+        hours for hours, mood in zip(columns.sleep, columns.mood) if mood >= 7
+    ]
+    min_sleep = min(stable_mood_sleeps) if stable_mood_sleeps else min(columns.sleep)
 
     return {
-        "coffee": f"{best_coffee[0]} cups/day",
-        "sleep": f"{best_sleep[0]} hours",
+        "coffee": f"{best_coffee} cups/day",
+        "sleep": f"{_bucket_label(best_sleep, 2.0)} hours",
         "cig_threshold": decline_threshold,
         "stable_mood_sleep": f"{min_sleep:.1f}h",
     }
@@ -140,16 +186,12 @@ def predict_crash_risk(entry: Entry) -> str:
     """
     Predict next-day crash risk based on overstimulation and sleep deficit.
     """
-    risk_score = 0
-
-    if entry.sleep < 5:
-        risk_score += 2
-    if entry.dls >= 8:
-        risk_score += 2
-    if entry.cig >= 4:
-        risk_score += 1
-    if entry.coffee >= 4:
-        risk_score += 1
+    risk_score = (
+        2 * (entry.sleep < 5)
+        + 2 * (entry.dls >= 8)
+        + (entry.cig >= 4)
+        + (entry.coffee >= 4)
+    )
 
     if risk_score >= 4:
         return "HIGH"
@@ -159,40 +201,76 @@ def predict_crash_risk(entry: Entry) -> str:
         return "LOW"
 
 
+def _knn_predict(
+    coffees: Sequence[float],
+    cigs: Sequence[float],
+    sleeps: Sequence[float],
+    gamings: Sequence[float],
+    focuses: Sequence[float],
+    moods: Sequence[float],
+    coffee: int,
+    cig: int,
+    sleep: float,
+    gaming: float,
+) -> tuple[float, float]:
+    """Weighted 5-nearest-neighbour focus/mood estimate over column data."""
+    # nlargest keeps a 5-element heap while consuming the generator, so only
+    # the current best neighbours are ever held in memory.
+    neighbours = heapq.nlargest(
+        5,
+        (
+            (
+                1 / (
+                    1
+                    + (
+                        abs(c - coffee) * 1.2
+                        + abs(k - cig) * 1.4
+                        + abs(s - sleep) * 0.8
+                        + abs(g - gaming) * 0.7
+                    )
+                ),
+                row,
+            )
+            for row, (c, k, s, g) in enumerate(zip(coffees, cigs, sleeps, gamings))
+        ),
+        key=itemgetter(0),
+    )
+    total_weight = sum(weight for weight, _ in neighbours)
+    if total_weight == 0:
+        return average(focuses), average(moods)
+
+    focus = sum(weight * focuses[row] for weight, row in neighbours) / total_weight
+    mood = sum(weight * moods[row] for weight, row in neighbours) / total_weight
+    return focus, mood
+
+
 def predict_from_history(
-    entries: list[Entry],
+    history: list[Entry] | Columns,
     coffee: int,
     cig: int,
     sleep: float,
     gaming: float,
 ) -> dict[str, float]:
     """Predict mood/focus using weighted similarity from historical records."""
-    if not entries:
+    if not history:
         return {"focus": 5.0, "mood": 5.0}
 
-    weights_and_entries: list[tuple[float, Entry]] = []
-    for entry in entries:
-        distance = (
-            abs(entry.coffee - coffee) * 1.2
-            + abs(entry.cig - cig) * 1.4
-            + abs(entry.sleep - sleep) * 0.8
-            + abs(entry.gaming - gaming) * 0.7
-        )
-        weight = 1 / (1 + distance)
-        weights_and_entries.append((weight, entry))
-
-    top_neighbors = sorted(weights_and_entries, key=lambda pair: pair[0], reverse=True)[:5]
-    total_weight = sum(weight for weight, _ in top_neighbors)
-    if total_weight == 0:
-        return {"focus": average([entry.focus for entry in entries]), "mood": average([entry.mood for entry in entries])}
-
-    focus = sum(weight * item.focus for weight, item in top_neighbors) / total_weight
-    mood = sum(weight * item.mood for weight, item in top_neighbors) / total_weight
-
+    columns = _as_columns(history)
+    focus, mood = _knn_predict(
+        columns.coffee,
+        columns.cig,
+        columns.sleep,
+        columns.gaming,
+        columns.focus,
+        columns.mood,
+        coffee,
+        cig,
+        sleep,
+        gaming,
+    )
     return {"focus": round(clamp(focus, 1, 10), 2), "mood": round(clamp(mood, 1, 10), 2)}
 
 
-
 def calculate_focus(deep_work: int, distraction: int) -> int:
     """
     Calculate focus score from behavioral inputs.
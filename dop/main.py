@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import argparse
+from bisect import bisect_left, bisect_right
 from datetime import date, timedelta
 
 from dop.models import Entry
@@ -25,6 +26,7 @@ from dop.storage import (
     StorageError,
     add_entry,
     get_entry_by_date,
+    load_columns,
     load_entries,
     remove_entry_by_date,
 )
@@ -49,11 +51,11 @@ def prompt_entry() -> Entry:
     # =====================
     # Stimulus Inputs
     # =====================
-    coffee = int(prompt_value("Coffee cups: ", int))
-    cig = int(prompt_value("Cigarettes: ", int))
-    sleep = float(prompt_value("Sleep hours: ", float))
-    gaming = float(prompt_value("Gaming hours: ", float))
-    coding = float(prompt_value("Coding hours: ", float))
+    coffee = prompt_value("Coffee cups: ", int)
+    cig = prompt_value("Cigarettes: ", int)
+    sleep = prompt_value("Sleep hours: ", float)
+    gaming = prompt_value("Gaming hours: ", float)
+    coding = prompt_value("Coding hours: ", float)
 
     validate_non_negative("Coffee", coffee)
     validate_non_negative("Cigarettes", cig)
@@ -71,13 +73,13 @@ def prompt_entry() -> Entry:
     print("0 = Couldn't focus")
     print("1 = Some focus")
     print("2 = Deep focus possible")
-    deep_work = int(prompt_value("Select (0-2): ", int))
+    deep_work = prompt_value("Select (0-2): ", int)
 
     print("Distraction Level:")
     print("0 = Constantly distracted")
     print("1 = Sometimes distracted")
     print("2 = Rarely distracted")
-    distraction = int(prompt_value("Select (0-2): ", int))
+    distraction = prompt_value("Select (0-2): ", int)
 
     # =====================
     # Mood Behavioral Inputs
@@ -87,13 +89,13 @@ def prompt_entry() -> Entry:
     print("0 = Irritable / unstable")
     print("1 = Normal")
     print("2 = Calm / positive")
-    stability = int(prompt_value("Select (0-2): ", int))
+    stability = prompt_value("Select (0-2): ", int)
 
     print("Satisfaction With Day:")
     print("0 = Bad day")
     print("1 = Neutral")
     print("2 = Good day")
-    satisfaction = int(prompt_value("Select (0-2): ", int))
+    satisfaction = prompt_value("Select (0-2): ", int)
 
     # =====================
     # Energy Behavioral Inputs
@@ -103,13 +105,13 @@ def prompt_entry() -> Entry:
     print("0 = Exhausted")
     print("1 = Normal")
     print("2 = Energized")
-    fatigue = int(prompt_value("Select (0-2): ", int))
+    fatigue = prompt_value("Select (0-2): ", int)
 
     print("Mental Sharpness:")
     print("0 = Foggy")
     print("1 = Normal")
     print("2 = Sharp")
-    sharpness = int(prompt_value("Select (0-2): ", int))
+    sharpness = prompt_value("Select (0-2): ", int)
 
     # =====================
     # Calculate Derived Scores
@@ -136,10 +138,14 @@ def prompt_entry() -> Entry:
     )
 
 
-def print_entry_summary(entry: Entry, title: str = "System Report") -> None:
+def print_entry_summary(
+    entry: Entry,
+    title: str = "System Report",
+    entries: list[Entry] | None = None,
+) -> None:
     """Print full styled system diagnostic report for an entry."""
 
-    print(f"\n{Color.CYAN}{Color.BOLD}══════════ DOP SYSTEM REPORT ══════════{Color.RESET}")
+    print(f"\n{Color.HEADER}══════════ DOP SYSTEM REPORT ══════════{Color.RESET}")
     print(f"{Color.MAGENTA}{title} ({entry.date}){Color.RESET}")
 
     # ======================
@@ -203,8 +209,7 @@ def print_entry_summary(entry: Entry, title: str = "System Report") -> None:
     # ======================
     # Sleep Debt Detection
     # ======================
-    entries = load_entries()
-    sleep_debt = detect_sleep_debt(entries)
+    sleep_debt = detect_sleep_debt(entries if entries is not None else load_columns())
 
     if sleep_debt > 0:
         print(
@@ -237,13 +242,14 @@ def print_entry_summary(entry: Entry, title: str = "System Report") -> None:
         for flag in flags:
             print(f"  - {flag}")
 
-    print(f"{Color.CYAN}{Color.BOLD}═══════════════════════════════════════{Color.RESET}\n")
+    print(f"{Color.HEADER}═══════════════════════════════════════{Color.ENDL}")
 
 
 def handle_entry() -> None:
     """Command handler for `dop e` with view/overwrite/cancel logic."""
 
     today = today_iso()
+    entries = load_entries()
     existing = get_entry_by_date(today)
 
     if existing:
@@ -256,12 +262,12 @@ def handle_entry() -> None:
             choice = input("Select (1-3): ").strip()
 
             if choice == "1":
-                print_entry_summary(existing, "Existing Entry")
+                print_entry_summary(existing, "Existing Entry", entries)
                 return
 
             elif choice == "2":
                 print("\nOverwriting existing entry...\n")
-                remove_entry_by_date(today)
+                remove_entry_by_date(today, entries=entries)
                 break
 
             elif choice == "3":
@@ -273,8 +279,8 @@ def handle_entry() -> None:
 
     # If no existing entry OR overwrite selected
     entry = prompt_entry()
-    add_entry(entry)
-    print_entry_summary(entry, "Entry saved")
+    add_entry(entry, entries=entries)
+    print_entry_summary(entry, "Entry saved", entries)
 
 
 
@@ -289,26 +295,29 @@ def handle_summary() -> None:
 
 def handle_weekly() -> None:
     """Command handler for `dop w`."""
-    entries = load_entries()
-    if not entries:
+    columns = load_columns()
+    if not columns:
         print("No data available for weekly analysis.")
         return
 
-    last_7 = { (date.today() - timedelta(days=offset)).isoformat() for offset in range(7) }
-    weekly_entries = [entry for entry in entries if entry.date in last_7]
-    if not weekly_entries:
+    # Columns are date-sorted, so the 7-day window is a contiguous slice.
+    today = date.today()
+    start = bisect_left(columns.date, (today - timedelta(days=6)).isoformat())
+    stop = bisect_right(columns.date, today.isoformat())
+    weekly = columns[start:stop]
+    if not weekly:
         print("No entries in the last 7 days.")
         return
 
-    moods = [entry.mood for entry in weekly_entries]
-    focuses = [entry.focus for entry in weekly_entries]
-    des_values = [entry.des for entry in weekly_entries]
-    sleeps = [entry.sleep for entry in weekly_entries]
-    coffees = [entry.coffee for entry in weekly_entries]
-    cigs = [entry.cig for entry in weekly_entries]
+    moods = weekly.mood
+    focuses = weekly.focus
+    des_values = weekly.des
+    sleeps = weekly.sleep
+    coffees = weekly.coffee
+    cigs = weekly.cig
 
     print("\n=== Weekly Analysis ===")
-    print(f"Entries analyzed: {len(weekly_entries)}")
+    print(f"Entries analyzed: {len(weekly)}")
     print(f"Average mood: {float_fmt(average(moods))}")
     print(f"Average focus: {float_fmt(average(focuses))}")
     print(f"Average DES: {float_fmt(average(des_values))}")
@@ -319,12 +328,12 @@ def handle_weekly() -> None:
 
 def handle_optimal() -> None:
     """Command handler for `dop o`."""
-    entries = load_entries()
-    if not entries:
+    columns = load_columns()
+    if not columns:
         print("No historical data available.")
         return
 
-    recommendations = detect_optimal_zone(entries)
+    recommendations = detect_optimal_zone(columns)
     print("\n=== Optimal Zone Detection ===")
     print(f"Best coffee range for focus: {recommendations['coffee']}")
     print(f"Best sleep range for focus: {recommendations['sleep']}")
@@ -334,20 +343,20 @@ def handle_optimal() -> None:
 
 def handle_predict() -> None:
     """Command handler for `dop predict`."""
-    entries = load_entries()
+    columns = load_columns()
 
     print("\nProvide hypothetical inputs:")
-    coffee = int(prompt_value("Coffee cups: ", int))
-    cig = int(prompt_value("Cigarettes: ", int))
-    sleep = float(prompt_value("Sleep hours: ", float))
-    gaming = float(prompt_value("Gaming hours: ", float))
+    coffee = prompt_value("Coffee cups: ", int)
+    cig = prompt_value("Cigarettes: ", int)
+    sleep = prompt_value("Sleep hours: ", float)
+    gaming = prompt_value("Gaming hours: ", float)
 
     validate_non_negative("Coffee", coffee)
     validate_non_negative("Cigarettes", cig)
     validate_sleep(sleep)
     validate_non_negative("Gaming", gaming)
 
-    prediction = predict_from_history(entries, coffee, cig, sleep, gaming)
+    prediction = predict_from_history(columns, coffee, cig, sleep, gaming)
     print("\n=== Prediction ===")
     print(f"Likely focus: {float_fmt(prediction['focus'])}/10")
     print(f"Likely mood: {float_fmt(prediction['mood'])}/10")
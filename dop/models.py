@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
-from typing import Any
+from array import array
+from dataclasses import dataclass, fields
+from typing import Any, Iterable
 
 
 @dataclass(slots=True)
@@ -24,13 +25,19 @@ class Entry:
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize an entry to a JSON-compatible dictionary."""
-        payload = asdict(self)
-        payload["sleep"] = round(self.sleep, 2)
-        payload["gaming"] = round(self.gaming, 2)
-        payload["coding"] = round(self.coding, 2)
-        payload["des"] = round(self.des, 2)
-        payload["dls"] = round(self.dls, 2)
-        return payload
+        return {
+            "date": self.date,
+            "coffee": self.coffee,
+            "cig": self.cig,
+            "sleep": round(self.sleep, 2),
+            "gaming": round(self.gaming, 2),
+            "coding": round(self.coding, 2),
+            "mood": self.mood,
+            "focus": self.focus,
+            "energy": self.energy,
+            "des": round(self.des, 2),
+            "dls": round(self.dls, 2),
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Entry":
@@ -48,3 +55,56 @@ class Entry:
             des=float(data["des"]),
             dls=float(data["dls"]),
         )
+
+
+def _int_column(typecode: str, values: list[int]) -> array:
+    """Pack ints into the compact typecode, widening if a value does not fit."""
+    try:
+        return array(typecode, values)
+    except OverflowError:
+        return array("q", values)
+
+
+@dataclass(slots=True)
+class Columns:
+    """Column-oriented (struct-of-arrays) view over a list of entries."""
+
+    date: list[str]
+    coffee: array
+    cig: array
+    sleep: array
+    gaming: array
+    coding: array
+    mood: array
+    focus: array
+    energy: array
+    des: array
+    dls: array
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def __getitem__(self, index: slice) -> "Columns":
+        """Return the columns restricted to a slice of rows."""
+        return Columns(*(getattr(self, field.name)[index] for field in fields(self)))
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Entry]) -> "Columns":
+        """Transpose entries into compact typed per-field arrays."""
+        # Scores fit in a byte and counts in a short (out-of-range records
+        # widen to int64); floats stay 64-bit because float32 shifts values
+        # like 0.65 across rounding boundaries.
+        entries = list(entries)
+        return cls(
+            date=[entry.date for entry in entries],
+            coffee=_int_column("H", [entry.coffee for entry in entries]),
+            cig=_int_column("H", [entry.cig for entry in entries]),
+            sleep=array("d", [entry.sleep for entry in entries]),
+            gaming=array("d", [entry.gaming for entry in entries]),
+            coding=array("d", [entry.coding for entry in entries]),
+            mood=_int_column("b", [entry.mood for entry in entries]),
+            focus=_int_column("b", [entry.focus for entry in entries]),
+            energy=_int_column("b", [entry.energy for entry in entries]),
+            des=array("d", [entry.des for entry in entries]),
+            dls=array("d", [entry.dls for entry in entries]),
+        )
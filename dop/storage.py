@@ -1,78 +1,247 @@
-"""Local JSON storage for DOP entries."""
+"""Local JSON storage for DOP entries (one JSON object per line)."""
 
 from __future__ import annotations
 
 import json
+import os
+import shutil
+from copy import copy
+from math import isfinite
+from operator import attrgetter
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from typing import IO, Any
 
-from dop.models import Entry
+from dop.models import Columns, Entry
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 DATA_FILE = Path(__file__).resolve().parent / "data.json"
 
+# Parsed entries, their date index and (lazily) their column view from the
+# last load, keyed on (path, mtime_ns, size).
+_CACHE: (
+    tuple[tuple[Path, int, int], list[Entry], dict[str, Entry], Columns | None] | None
+) = None
+
+# Paths already checked for the legacy JSON-array layout in this process.
+_MIGRATION_CHECKED: set[Path] = set()
+
 
 class StorageError(Exception):
     """Raised when storage operations fail."""
 
 
+def _dumps(item: dict[str, Any]) -> bytes:
+    """Serialize one record to compact JSON bytes, rejecting NaN/infinity.
+
+    orjson would write non-finite floats as null and stdlib json as bare NaN,
+    so neither is allowed on disk.
+    """
+    if any(isinstance(value, float) and not isfinite(value) for value in item.values()):
+        raise StorageError(f"Cannot store non-finite value in entry {item.get('date')}")
+    if orjson is not None:
+        return orjson.dumps(item)
+    return json.dumps(item, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes; both backends raise json.JSONDecodeError on bad input."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except json.JSONDecodeError:
+            # Older files may hold NaN/Infinity written by stdlib json.
+            return json.loads(raw)
+    return json.loads(raw)
+
+
 def ensure_data_file(path: Path = DATA_FILE) -> None:
-    """Create data file if it does not already exist."""
+    """Create data file if missing and migrate the legacy JSON-array layout."""
     if not path.exists():
-        path.write_text("[]\n", encoding="utf-8")
+        path.write_text("", encoding="utf-8")
+        _MIGRATION_CHECKED.add(path)
+        return
+    if path in _MIGRATION_CHECKED:
+        return
 
+    _MIGRATION_CHECKED.add(path)
+    with path.open("rb") as handle:
+        head = handle.read(64).lstrip()
+    if head.startswith(b"["):
+        _migrate_array_file(path)
+
+
+def _migrate_array_file(path: Path) -> None:
+    """Rewrite a pre-NDJSON `[...]` data file as one entry per line."""
+    try:
+        payload = _loads(path.read_bytes())
+    except json.JSONDecodeError:
+        # Leave it in place; load_entries moves unreadable files aside.
+        return
+    _write_lines(payload, path)
+
+
+def _write_lines(payload: list[dict[str, Any]], path: Path) -> None:
+    """Atomically replace path with one JSON object per line."""
+    with NamedTemporaryFile("wb", delete=False, dir=path.parent) as temp:
+        temp.write(b"".join(_dumps(item) + b"\n" for item in payload))
+        temp_path = Path(temp.name)
+
+    temp_path.replace(path)
+
+
+def _cache_key(path: Path) -> tuple[Path, int, int]:
+    """Identify the current on-disk state of a data file."""
+    stat = path.stat()
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _remember(path: Path, entries: list[Entry]) -> None:
+    """Cache entries (date-sorted), plus a date index, as the content of path."""
+    global _CACHE
+    ordered = sorted(entries, key=attrgetter("date"))
+    _CACHE = (
+        _cache_key(path),
+        ordered,
+        {entry.date: entry for entry in ordered},
+        None,
+    )
+
+
+def _parse_lines(handle: IO[bytes]) -> tuple[list[Entry], bool]:
+    """Parse NDJSON records, tolerating an unreadable final line.
+
+    Returns the entries and whether a trailing line (e.g. a write cut off
+    partway) had to be skipped. Unreadable lines elsewhere still raise.
+    """
+    entries: list[Entry] = []
+    broken: json.JSONDecodeError | None = None
+    for line in handle:
+        if not line.strip():
+            continue
+        if broken is not None:
+            raise broken
+        try:
+            payload = _loads(line)
+        except json.JSONDecodeError as err:
+            broken = err
+            continue
+        entries.append(Entry.from_dict(payload))
+    return entries, broken is not None
+
+
+def _load_cached(path: Path) -> tuple[list[Entry], dict[str, Entry]]:
+    """Return the cached entries and date index for path, reloading if stale."""
+    global _CACHE
+    if _CACHE is not None:
+        try:
+            key = _cache_key(path)
+        except FileNotFoundError:
+            key = None
+        if _CACHE[0] == key:
+            return _CACHE[1], _CACHE[2]
 
-def load_entries(path: Path = DATA_FILE) -> list[Entry]:
-    """Load all entries from JSON storage, gracefully recovering from corruption."""
     ensure_data_file(path)
+
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        if not isinstance(payload, list):
-            raise StorageError("Invalid data file format: expected a list")
-        return [Entry.from_dict(item) for item in payload]
+        # Parse line by line so only one raw record is held at a time.
+        with path.open("rb") as handle:
+            entries, truncated = _parse_lines(handle)
     except json.JSONDecodeError:
+        _CACHE = None
         backup = path.with_suffix(".corrupt.json")
         path.replace(backup)
         ensure_data_file(path)
-        return []
+        entries, truncated = [], False
     except (KeyError, TypeError, ValueError) as err:
         raise StorageError(f"Invalid entry in data file: {err}") from err
 
+    if truncated:
+        # Back up the original, then atomically rewrite it without the
+        # unreadable last line, so data.json exists at every step.
+        shutil.copy2(path, path.with_suffix(".corrupt.json"))
+        _write_lines([entry.to_dict() for entry in entries], path)
+
+    _remember(path, entries)
+    return _CACHE[1], _CACHE[2]
+
+
+def load_entries(path: Path = DATA_FILE) -> list[Entry]:
+    """Load all entries sorted by date, gracefully recovering from corruption.
+
+    The list is the caller's own, but the entries are shared with the
+    in-process cache: treat them as read-only and use dataclasses.replace()
+    to derive a modified entry.
+    """
+    entries, _ = _load_cached(path)
+    return list(entries)
+
+
+def load_columns(path: Path = DATA_FILE) -> Columns:
+    """Load all entries as column arrays, rebuilt only when the file changes.
+
+    The returned Columns is shared with the in-process cache and must be
+    treated as read-only; slicing it (columns[a:b]) yields independent arrays.
+    """
+    global _CACHE
+    entries, _ = _load_cached(path)
+    if _CACHE[3] is None:
+        _CACHE = (*_CACHE[:3], Columns.from_entries(entries))
+    return _CACHE[3]
+
 
 def save_entries(entries: list[Entry], path: Path = DATA_FILE) -> None:
     """Safely persist entries to disk using atomic write/replace."""
     ensure_data_file(path)
-    serialized = [entry.to_dict() for entry in entries]
+    _write_lines([entry.to_dict() for entry in entries], path)
+    # Cache private copies so later edits by the caller cannot leak in.
+    _remember(path, list(map(copy, entries)))
 
-    with NamedTemporaryFile("w", delete=False, encoding="utf-8", dir=path.parent) as temp:
-        json.dump(serialized, temp, indent=2)
-        temp.write("\n")
-        temp_path = Path(temp.name)
-
-    temp_path.replace(path)
 
+def add_entry(entry: Entry, path: Path = DATA_FILE, entries: list[Entry] | None = None) -> None:
+    """Append a new entry, enforcing one-entry-per-date.
 
-def add_entry(entry: Entry, path: Path = DATA_FILE) -> None:
-    """Append a new entry, enforcing one-entry-per-date."""
-    entries = load_entries(path)
-    if any(item.date == entry.date for item in entries):
+    The duplicate check always runs against the current file contents. When
+    given, `entries` is the caller's loaded list and gets the entry appended.
+    """
+    cached, index = _load_cached(path)
+    if entry.date in index:
         raise StorageError(f"Entry already exists for date {entry.date}")
 
-    entries.append(entry)
-    save_entries(entries, path)
+    with path.open("r+b") as handle:
+        # Terminate a last record left without its newline before appending.
+        end = handle.seek(0, os.SEEK_END)
+        prefix = b""
+        if end:
+            handle.seek(end - 1)
+            if handle.read(1) != b"\n":
+                prefix = b"\n"
+        handle.write(prefix + _dumps(entry.to_dict()) + b"\n")
 
-
-def get_entry_by_date(target_date: str, path: Path = DATA_FILE) -> Entry | None:
-    """Return entry for a specific date."""
-    entries = load_entries(path)
-    for entry in entries:
-        if entry.date == target_date:
-            return entry
-    return None
+    _remember(path, [*cached, copy(entry)])
+    if entries is not None:
+        entries.append(entry)
 
 
-
-def remove_entry_by_date(target_date: str, path: Path = DATA_FILE) -> None:
-    """Remove entry for a specific date."""
-    entries = load_entries(path)
-    updated = [entry for entry in entries if entry.date != target_date]
-    save_entries(updated, path)
+def get_entry_by_date(target_date: str, path: Path = DATA_FILE) -> Entry | None:
+    """Return entry for a specific date (shared with the cache; read-only)."""
+    _, index = _load_cached(path)
+    return index.get(target_date)
+
+
+def remove_entry_by_date(
+    target_date: str,
+    path: Path = DATA_FILE,
+    entries: list[Entry] | None = None,
+) -> None:
+    """Remove entry for a specific date, updating `entries` in place if given."""
+    cached, index = _load_cached(path)
+    if entries is not None:
+        entries[:] = [entry for entry in entries if entry.date != target_date]
+    if target_date not in index:
+        return
+    save_entries([entry for entry in cached if entry.date != target_date], path)
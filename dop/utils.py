@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Callable
+from math import isfinite
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
 
 
 # ======================
@@ -18,6 +21,9 @@ class Color:
     MAGENTA = "\033[95m"
     BOLD = "\033[1m"
     RESET = "\033[0m"
+    # Combined sequences, concatenated once at import time.
+    HEADER = CYAN + BOLD
+    ENDL = RESET + "\n"
 
 
 def today_iso() -> str:
@@ -31,7 +37,9 @@ def clamp(value: float, lower: float, upper: float) -> float:
 
 
 def validate_non_negative(name: str, value: float) -> None:
-    """Raise ValueError if value is negative."""
+    """Raise ValueError if value is negative or not a finite number."""
+    if not isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
     if value < 0:
         raise ValueError(f"{name} cannot be negative")
 
@@ -49,7 +57,7 @@ def validate_sleep(hours: float) -> None:
     validate_non_negative("Sleep", hours)
 
 
-def prompt_value(prompt: str, caster: Callable[[str], float | int]) -> float | int:
+def prompt_value(prompt: str, caster: Callable[[str], T]) -> T:
     """Prompt until a valid value is parsed."""
     while True:
         raw = input(prompt).strip()
@@ -63,9 +71,14 @@ def float_fmt(value: float) -> str:
     """Format floating-point values consistently."""
     return f"{value:.2f}"
 
-def progress_bar(value: float, max_value: float = 10, width: int = 30) -> str:
+_BAR_WIDTH = 30
+_BAR_FULL = "█" * _BAR_WIDTH
+_BAR_EMPTY = "-" * _BAR_WIDTH
+
+
+def progress_bar(value: float, max_value: float = 10, width: int = _BAR_WIDTH) -> str:
     """Generate ASCII progress bar."""
-    ratio = max(0, min(value / max_value, 1))
-    filled = int(ratio * width)
-    bar = "█" * filled + "-" * (width - filled)
-    return f"[{bar}] {value:.2f}/{max_value}"
+    filled = int(clamp(value / max_value, 0, 1) * width)
+    if width <= _BAR_WIDTH:
+        return f"[{_BAR_FULL[:filled]}{_BAR_EMPTY[:width - filled]}] {value:.2f}/{max_value}"
+    return f"[{'█' * filled}{'-' * (width - filled)}] {value:.2f}/{max_value}"